@@ -4,8 +4,15 @@ Utility script to check video properties and verify frame counts.
 import cv2
 import sys
 
-def check_video(video_path):
-    """Check video properties."""
+def check_video(video_path, exact=False):
+    """
+    Check video properties.
+    
+    The frame count is taken from the container index by seeking to the end,
+    which takes constant time. Index counts can still disagree with the number
+    of decodable frames for broken or truncated streams; pass exact=True to
+    walk the whole stream instead.
+    """
     print(f"\n{'='*60}")
     print(f"VIDEO ANALYSIS: {video_path}")
     print(f"{'='*60}")
@@ -33,13 +40,23 @@ def check_video(video_path):
     print(f"  Reported frames: {total_frames}")
     
     # Count actual frames
-    print(f"\n⏳ Counting actual frames...")
     frame_count = 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frame_count += 1
+    if not exact:
+        # Seek to the end of the container and read back the position
+        cap.set(cv2.CAP_PROP_POS_AVI_RATIO, 1.0)
+        frame_count = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if frame_count > 0:
+            end_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+            print(f"\n⏩ Seeked to end: frame {frame_count} at {end_msec / 1000:.2f}s")
+        else:
+            # Some containers don't support seeking by ratio
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    
+    if frame_count <= 0:
+        print(f"\n⏳ Counting actual frames...")
+        # grab() only advances the stream; no frame is decoded into a BGR buffer
+        while cap.grab():
+            frame_count += 1
     
     print(f"  Actual frames read: {frame_count}")
     
@@ -62,11 +79,11 @@ def check_video(video_path):
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: py check_video.py <video_path>")
+        print("Usage: py check_video.py <video_path> [--exact]")
         print("\nExample:")
         print("  py check_video.py samples/input.mp4")
-        print("  py check_video.py output/result.mp4")
+        print("  py check_video.py output/result.mp4 --exact  # count every frame")
         sys.exit(1)
     
     video_path = sys.argv[1]
-    check_video(video_path)
+    check_video(video_path, exact="--exact" in sys.argv[2:])
@@ -5,12 +5,7 @@ Vehicle Detection System - Main Entry Point
 Process videos to detect, track, and count vehicles and people crossing a line.
 """
 
-# IMPORTANT: Set this BEFORE importing any modules that use OpenCV
-# OpenCV reads this environment variable when it's first loaded
 import os
-os.environ['OPENCV_FFMPEG_READ_ATTEMPTS'] = '100000'  # Increased for multi-stream videos
-os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = 'rtsp_transport;udp'
-
 import sys
 from pathlib import Path
 import click
@@ -24,8 +19,8 @@ from src.video_processor import VideoProcessor
 @click.command()
 @click.option(
     '--input', '-i',
-    type=click.Path(exists=True),
-    help='Path to input video file'
+    type=str,
+    help='Path to input video file or rtsp:// stream URL'
 )
 @click.option(
     '--output', '-o',
@@ -93,8 +88,9 @@ def main(input, output, config, line, no_display, no_save):
     if no_save:
         app_config.video.save_output = False
     
-    # Validate input file exists
-    if not os.path.exists(app_config.video.input_path):
+    # Validate input file exists (stream URLs are checked when opened)
+    is_stream = '://' in app_config.video.input_path
+    if not is_stream and not os.path.exists(app_config.video.input_path):
         click.echo(f"Error: Input file not found: {app_config.video.input_path}", err=True)
         click.echo("\nPlease provide a valid input video using --input option.", err=True)
         sys.exit(1)
@@ -0,0 +1,78 @@
+"""
+Opening inputs with OpenCV's FFmpeg backend, shared by the reader thread and the decoder process.
+"""
+import cv2
+import os
+from typing import List, Optional
+
+def ffmpeg_params(hw_accel: bool) -> List[int]:
+    """
+    Get the cv2.VideoCapture open parameters for the FFmpeg backend.
+
+    Args:
+        hw_accel: Whether to request hardware decoding
+
+    Returns:
+        Flat list of property IDs and values (empty if hw_accel is off)
+    """
+    if not hw_accel:
+        return []
+    # CAP_PROP_HW_DEVICE can't be combined with VIDEO_ACCELERATION_ANY, so
+    # FFmpeg picks the device
+    return [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+
+def open_ffmpeg_capture(input_path: str,
+                        hw_accel: bool,
+                        hw_decoder: Optional[str] = None,
+                        verbose: bool = True) -> cv2.VideoCapture:
+    """
+    Open the input with FFmpeg, requesting hardware decoding if enabled.
+
+    Args:
+        input_path: Path to input video or stream URL
+        hw_accel: Whether to request hardware decoding
+        hw_decoder: FFmpeg decoder to force when OpenCV's hardware acceleration
+            is not available (e.g. "h264_cuvid"), or None
+        verbose: Print which decoding path was taken
+
+    Returns:
+        Opened VideoCapture (check isOpened() before use)
+    """
+    if not hw_accel:
+        return cv2.VideoCapture(input_path, cv2.CAP_FFMPEG)
+
+    cap = cv2.VideoCapture(input_path, cv2.CAP_FFMPEG, ffmpeg_params(hw_accel))
+    if not cap.isOpened():
+        return cv2.VideoCapture(input_path, cv2.CAP_FFMPEG)
+
+    if int(cap.get(cv2.CAP_PROP_HW_ACCELERATION)) != cv2.VIDEO_ACCELERATION_NONE:
+        if verbose:
+            print("Hardware-accelerated decoding enabled.")
+        return cap
+
+    if not hw_decoder:
+        if verbose:
+            print("Hardware-accelerated decoding not available, decoding on CPU.")
+        return cap
+
+    # Fall back to forcing a specific FFmpeg decoder through the capture options
+    options = os.environ.get('OPENCV_FFMPEG_CAPTURE_OPTIONS')
+    forced = f"video_codec;{hw_decoder}"
+    os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = f"{options}|{forced}" if options else forced
+    try:
+        hw_cap = cv2.VideoCapture(input_path, cv2.CAP_FFMPEG)
+    finally:
+        if options is None:
+            del os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS']
+        else:
+            os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = options
+
+    if hw_cap.isOpened():
+        if verbose:
+            print(f"Hardware-accelerated decoding enabled via {hw_decoder}.")
+        cap.release()
+        return hw_cap
+
+    if verbose:
+        print(f"Could not open video with {hw_decoder}, decoding on CPU.")
+    return cap
@@ -3,6 +3,9 @@ from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 import os
 
+# libyaml's C loader is much faster than the pure-Python one when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 @dataclass
 class ModelConfig:
     name: str = "yolo11n.pt"
@@ -10,12 +13,20 @@ class ModelConfig:
     iou_threshold: float = 0.45
     classes: List[int] = field(default_factory=lambda: [2, 3, 5, 7, 0])
     device: str = "cpu"
+    batch_size: int = 1  # Frames per detector call; 4-8 keeps a GPU busy
+    detect_every: int = 1  # Run detection on every Nth processed frame; the tracker predicts the rest
+    format: str = "pt"  # "pt", "engine", "openvino", "onnx" or "auto" (engine on CUDA, openvino on CPU)
+    precision: str = "fp32"  # "fp32", "fp16" or "int8" for exported formats
+    gpu_preprocess: bool = False  # Letterbox/normalize frames on the GPU (CUDA only)
+    imgsz: int = 640  # Model input size for gpu_preprocess and exported formats (multiple of 32)
 
 @dataclass
 class TrackerConfig:
     max_age: int = 30
     n_init: int = 3
     max_iou_distance: float = 0.7
+    embedder: str = "mobilenet"  # DeepSORT re-ID embedder, e.g. "mobilenet" or "torchreid"
+    embedder_gpu: Optional[bool] = None  # None = run on GPU when model.device is CUDA
 
 @dataclass
 class LineConfig:
@@ -30,6 +41,12 @@ class VideoConfig:
     save_output: bool = True
     fps: int = 30
     resolution: List[int] = field(default_factory=lambda: [1280, 720])
+    frame_stride: int = 1  # Process every Nth frame; skipped frames are grabbed but not decoded
+    hw_accel: bool = True  # Request hardware-accelerated decoding from the FFmpeg backend
+    hw_decoder: Optional[str] = None  # FFmpeg decoder to force if hw_accel is not honored (e.g. "h264_cuvid")
+    hw_encode: bool = True  # Write H.264 with a hardware encoder when available (falls back to mp4v)
+    backend: str = "ffmpeg"  # "ffmpeg", "gstreamer" (used for rtsp:// inputs), "vpf" or "cudacodec" (NVDEC to GPU tensors)
+    reader_process: bool = False  # Decode in a separate process, sharing frames through shared memory
 
 @dataclass
 class VisualizationConfig:
@@ -55,7 +72,7 @@ class AppConfig:
             return cls()
 
         with open(config_path, 'r') as f:
-            config_dict = yaml.safe_load(f)
+            config_dict = yaml.load(f, Loader=_YamlLoader)
 
         if not config_dict:
             return cls()
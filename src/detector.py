@@ -1,7 +1,9 @@
 from ultralytics import YOLO
 import numpy as np
 import torch
-from typing import List
+import torch.nn.functional as F
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from .config import AppConfig
 
@@ -16,6 +18,13 @@ def _safe_load(*args, **kwargs):
 
 torch.load = _safe_load
 
+# Path suffix Ultralytics gives each export format
+EXPORT_SUFFIXES = {
+    "engine": ".engine",
+    "onnx": ".onnx",
+    "openvino": "_openvino_model",
+}
+
 
 @dataclass
 class Detection:
@@ -25,6 +34,29 @@ class Detection:
     class_id: int
     class_name: str
 
+@dataclass
+class DetectionBatch:
+    """Struct-of-arrays container for all detections in a frame."""
+    xyxy: np.ndarray  # [N, 4] float32 boxes as x1, y1, x2, y2
+    conf: np.ndarray  # [N] float32 confidences
+    cls: np.ndarray  # [N] int32 class IDs
+    names: Dict[int, str]  # Class ID -> class name
+
+    def __len__(self) -> int:
+        return len(self.cls)
+
+    def __iter__(self) -> Iterator[Detection]:
+        """Yield legacy Detection objects for callers that need them."""
+        # Convert each array to Python numbers in one call, not per element
+        for bbox, confidence, class_id in zip(
+                self.xyxy.tolist(), self.conf.tolist(), self.cls.tolist()):
+            yield Detection(
+                bbox=bbox,
+                confidence=confidence,
+                class_id=class_id,
+                class_name=self.names[class_id]
+            )
+
 class ObjectDetector:
     """
     Wrapper for YOLOv11 model to handle object detection.
@@ -38,15 +70,94 @@ class ObjectDetector:
         """
         self.config = config
         self.device = config.model.device
-        print(f"Loading model: {config.model.name} on device: {self.device}...")
-        self.model = YOLO(config.model.name)
-        # Move model to specified device (GPU/CPU)
-        self.model.to(self.device)
+        model_path = self._resolve_model_path()
+        print(f"Loading model: {model_path} on device: {self.device}...")
+        if model_path.endswith(".pt"):
+            self.model = YOLO(model_path)
+            # Move model to specified device (GPU/CPU)
+            self.model.to(self.device)
+        else:
+            # Exported models are bound to their runtime and can't be moved
+            self.model = YOLO(model_path, task="detect")
         self.classes = set(config.model.classes)
+        # Sorted class IDs for vectorized filtering with np.isin
+        self._classes_arr = np.array(sorted(self.classes), dtype=np.int32)
+        # YOLO.names re-validates the class dict on every access; resolve it once
+        self._names = self.model.names
         self.conf_threshold = config.model.confidence_threshold
+        
+        # GPU preprocessing state, specialized to the input resolution on first use
+        self._gpu_preprocess = (config.model.gpu_preprocess and
+                                self.device.lower().startswith("cuda"))
+        self._imgsz = config.model.imgsz
+        self._pinned: Optional[torch.Tensor] = None  # [B, H, W, 3] uint8 page-locked host buffer
+        self._device_frames: Optional[torch.Tensor] = None  # [B, H, W, 3] uint8 on device
+        self._device_input: Optional[torch.Tensor] = None  # [B, 3, imgsz, imgsz] letterboxed input
+        self._input_frame_size: Optional[Tuple[int, int]] = None
         print(f"Model loaded successfully on {self.device.upper()}.")
 
-    def detect(self, frame: np.ndarray) -> List[Detection]:
+    def _resolve_model_path(self) -> str:
+        """
+        Get the model to load, exporting a quantized artifact if needed.
+        
+        Returns:
+            Path to the exported model, or the PyTorch weights for format "pt"
+            or when the export fails
+        """
+        model_config = self.config.model
+        fmt = model_config.format.lower()
+        if fmt == "auto":
+            fmt = "engine" if self.device.lower().startswith("cuda") else "openvino"
+        if fmt == "pt":
+            return model_config.name
+        if fmt not in EXPORT_SUFFIXES:
+            raise ValueError(f"Unknown model format: {model_config.format}")
+        
+        # Reuse a previous export made with the same settings; they are part of the
+        # artifact name, so changing the precision, batch size or imgsz re-exports
+        exported_path = self._export_path(fmt)
+        if os.path.exists(exported_path):
+            print(f"Using cached {fmt} export: {exported_path}")
+            return exported_path
+        
+        precision = model_config.precision.lower()
+        batch = max(1, model_config.batch_size)
+        print(f"Exporting {model_config.name} to {fmt} "
+              f"({precision}, batch {batch}, imgsz {model_config.imgsz})...")
+        try:
+            # Exported models have a fixed batch and Ultralytics splits larger
+            # inputs into calls of that batch, so export the BatchedDetector's batch
+            path = YOLO(model_config.name).export(
+                format=fmt,
+                half=precision == "fp16",
+                int8=precision == "int8",
+                batch=batch,
+                # The input shape is fixed too; gpu_preprocess letterboxes to imgsz
+                imgsz=model_config.imgsz,
+                device=self.device)
+        except Exception as e:
+            print(f"Warning: export to {fmt} failed ({e}). Using FP32 PyTorch model.")
+            return model_config.name
+        os.replace(path, exported_path)
+        return exported_path
+
+    def _export_path(self, fmt: str) -> str:
+        """
+        Get the path of the exported artifact for the configured settings.
+        
+        Args:
+            fmt: Export format (a key of EXPORT_SUFFIXES)
+            
+        Returns:
+            Path such as yolo11n_640_fp16_b4.engine
+        """
+        model_config = self.config.model
+        stem = os.path.splitext(model_config.name)[0]
+        tag = (f"{model_config.imgsz}_{model_config.precision.lower()}"
+               f"_b{max(1, model_config.batch_size)}")
+        return f"{stem}_{tag}{EXPORT_SUFFIXES[fmt]}"
+
+    def detect(self, frame: np.ndarray) -> DetectionBatch:
         """
         Run YOLOv11 detection on a single frame.
         
@@ -54,37 +165,240 @@ class ObjectDetector:
             frame: Input image/frame as numpy array (BGR)
             
         Returns:
-            List of Detection objects
+            DetectionBatch with the detections of the selected classes
+        """
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: Sequence[np.ndarray]) -> List[DetectionBatch]:
+        """
+        Run YOLOv11 detection on several frames in a single model call.
+        
+        Args:
+            frames: Input images/frames as numpy arrays (BGR)
+            
+        Returns:
+            One DetectionBatch per input frame, in order
+        """
+        if self._gpu_preprocess:
+            model_input, letterbox = self._preprocess_cuda(frames)
+            return self._predict(model_input, letterbox)
+        return self._predict(list(frames))
+
+    def detect_tensor(self, images: torch.Tensor) -> List[DetectionBatch]:
+        """
+        Run YOLOv11 detection on frames that are already on the GPU.
+        
+        Skips the host-to-device upload of detect_batch; used with GPU decoders.
+        
+        Args:
+            images: [B, 3, H, W] or [3, H, W] uint8 RGB tensor
+            
+        Returns:
+            One DetectionBatch per input frame, in order
+        """
+        if images.dim() == 3:
+            images = images.unsqueeze(0)
+        images = images.to(self.device).float().div_(255)
+        model_input, letterbox = self._letterbox_cuda(images)
+        return self._predict(model_input, letterbox)
+
+    def _predict(self, source, letterbox: Optional[tuple] = None) -> List[DetectionBatch]:
+        """
+        Run the model and convert each result into a DetectionBatch.
+        
+        Args:
+            source: List of BGR frames, or a letterboxed [B, 3, imgsz, imgsz] tensor
+            letterbox: Letterbox parameters when source is a tensor
+            
+        Returns:
+            One DetectionBatch per input frame, in order
         """
         # Run inference on specified device (GPU/CPU)
         # verbose=False suppresses the default printing to stdout
         results = self.model(
-            frame, 
+            source, 
             verbose=False, 
             conf=self.conf_threshold, 
             device=self.device,
-            iou=self.config.model.iou_threshold)[0]
+            iou=self.config.model.iou_threshold)
+
+        return [self._to_batch(result, letterbox) for result in results]
 
-        detections = []
+    def _preprocess_cuda(self, frames: Sequence[np.ndarray]) -> Tuple[torch.Tensor, tuple]:
+        """
+        Upload BGR frames through a pinned buffer and letterbox them on the GPU.
         
-        # Process results
-        for box in results.boxes:
-            class_id = int(box.cls[0])
+        Args:
+            frames: Input images/frames as numpy arrays (BGR), all the same size
             
-            # Filter by class
-            if class_id not in self.classes:
-                continue
-                
-            # Get coordinates
-            x1, y1, x2, y2 = box.xyxy[0].tolist()
-            conf = float(box.conf[0])
-            class_name = self.model.names[class_id]
+        Returns:
+            Tuple of ([B, 3, imgsz, imgsz] model input, letterbox parameters)
+        """
+        batch = len(frames)
+        height, width = frames[0].shape[:2]
+        if (self._pinned is None or self._pinned.shape[0] < batch or
+                self._pinned.shape[1:3] != (height, width)):
+            self._pinned = torch.empty((batch, height, width, 3), dtype=torch.uint8).pin_memory()
+            self._device_frames = torch.empty_like(self._pinned, device=self.device)
+        
+        pinned = self._pinned.numpy()
+        for i, frame in enumerate(frames):
+            np.copyto(pinned[i], frame)
+        device_frames = self._device_frames[:batch]
+        device_frames.copy_(self._pinned[:batch], non_blocking=True)
+        
+        # [B, H, W, 3] BGR uint8 -> [B, 3, H, W] RGB float in [0, 1]
+        images = device_frames.permute(0, 3, 1, 2).flip(1).float().div_(255)
+        return self._letterbox_cuda(images)
+
+    def _letterbox_cuda(self, images: torch.Tensor) -> Tuple[torch.Tensor, tuple]:
+        """
+        Resize images into the padded square model input, keeping aspect ratio.
+        
+        Args:
+            images: [B, 3, H, W] RGB float tensor in [0, 1] on the model device
             
-            detections.append(Detection(
-                bbox=[x1, y1, x2, y2],
-                confidence=conf,
-                class_id=class_id,
-                class_name=class_name
-            ))
+        Returns:
+            Tuple of ([B, 3, imgsz, imgsz] model input,
+            (scale, left, top, width, height) to map boxes back to the frame)
+        """
+        batch, _, height, width = images.shape
+        size = self._imgsz
+        scale = min(size / height, size / width)
+        new_h, new_w = round(height * scale), round(width * scale)
+        top, left = (size - new_h) // 2, (size - new_w) // 2
+        
+        # The padding border only has to be written when the frame size changes
+        if (self._device_input is None or self._device_input.shape[0] < batch or
+                self._input_frame_size != (height, width)):
+            self._device_input = torch.full(
+                (batch, 3, size, size), 114 / 255, dtype=torch.float32, device=images.device)
+            self._input_frame_size = (height, width)
+        
+        model_input = self._device_input[:batch]
+        model_input[:, :, top:top + new_h, left:left + new_w] = F.interpolate(
+            images, size=(new_h, new_w), mode="bilinear", align_corners=False)
+        return model_input, (scale, left, top, width, height)
+
+    def _to_batch(self, result, letterbox: Optional[tuple] = None) -> DetectionBatch:
+        """
+        Convert one Ultralytics result into a DetectionBatch.
+        
+        Args:
+            result: Ultralytics Results object for a single frame
+            letterbox: Parameters from _letterbox_cuda if the frame was
+                preprocessed on the GPU, to map boxes back to frame coordinates
             
+        Returns:
+            DetectionBatch with the detections of the selected classes
+        """
+        # Copy all boxes off the device in one transfer: [N, 6] of x1, y1, x2, y2, conf, cls
+        data = result.boxes.data.detach().cpu().numpy()
+        xyxy = data[:, :4].astype(np.float32)
+        conf = data[:, -2].astype(np.float32)
+        cls = data[:, -1].astype(np.int32)
+        
+        if letterbox is not None:
+            scale, left, top, width, height = letterbox
+            xyxy[:, [0, 2]] = ((xyxy[:, [0, 2]] - left) / scale).clip(0, width)
+            xyxy[:, [1, 3]] = ((xyxy[:, [1, 3]] - top) / scale).clip(0, height)
+        
+        # Filter by class
+        mask = np.isin(cls, self._classes_arr)
+        return DetectionBatch(
+            xyxy=xyxy[mask],
+            conf=conf[mask],
+            cls=cls[mask],
+            names=self._names
+        )
+
+class BatchedDetector:
+    """
+    Micro-batcher that accumulates frames and detects them in one model call.
+    
+    With detect_every > 1 only every Nth frame is sent to the model; the others
+    get None instead of detections so the tracker predicts them from its motion model.
+    """
+    def __init__(self, detector: ObjectDetector, batch_size: int, detect_every: int = 1):
+        """
+        Initialize the batcher.
+        
+        Args:
+            detector: Detector used to run the batched inference
+            batch_size: Number of detected frames per model call
+            detect_every: Run detection on every Nth submitted frame
+        """
+        self.detector = detector
+        self.batch_size = max(1, batch_size)
+        self.detect_every = max(1, detect_every)
+        # Frames held per flush; each flush starts on a detected frame
+        self.capacity = self.batch_size * self.detect_every
+        # Host frames are kept by reference; they are drawn on and written
+        # after detection, so they must not be shared between batches
+        self._frames: List[np.ndarray] = []
+        # Ring of [3, H, W] frames on the GPU, used when frames come from a GPU decoder
+        self._device_ring: Optional[torch.Tensor] = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        """Whether the batch is ready to be flushed."""
+        return self._count >= self.capacity
+
+    @property
+    def frames(self) -> List[np.ndarray]:
+        """
+        Frames submitted since the last flush, in order, as BGR numpy arrays.
+        
+        GPU frames are downloaded to the host in one copy for tracking and drawing.
+        """
+        if self._device_ring is not None:
+            host = self._device_ring[:self._count].permute(0, 2, 3, 1).flip(3).contiguous()
+            return list(host.cpu().numpy())
+        return list(self._frames)
+
+    def submit(self, frame) -> None:
+        """
+        Add a frame to the current batch.
+        
+        Args:
+            frame: Input image/frame as numpy array (BGR), or a [3, H, W]
+                uint8 RGB tensor from a GPU decoder
+        """
+        if self.full:
+            raise RuntimeError("Batch is full; call flush() first")
+        if torch.is_tensor(frame):
+            if (self._device_ring is None or
+                    (self._count == 0 and self._device_ring.shape[1:] != frame.shape)):
+                self._device_ring = torch.empty(
+                    (self.capacity, *frame.shape), dtype=frame.dtype, device=frame.device)
+            self._device_ring[self._count].copy_(frame)
+            self._count += 1
+            return
+        self._frames.append(frame)
+        self._count += 1
+
+    def flush(self) -> List[Optional[DetectionBatch]]:
+        """
+        Detect all buffered frames and start a new batch.
+        
+        Returns:
+            One entry per buffered frame, in submission order: a DetectionBatch,
+            or None for frames skipped by detect_every
+        """
+        if self._count == 0:
+            return []
+        step = self.detect_every
+        if self._device_ring is not None:
+            detected = self.detector.detect_tensor(self._device_ring[:self._count:step])
+        else:
+            detected = self.detector.detect_batch(self._frames[::step])
+        
+        detections = [detected[i // step] if i % step == 0 else None
+                      for i in range(self._count)]
+        self._frames.clear()
+        self._count = 0
         return detections
@@ -0,0 +1,107 @@
+"""
+Shared-memory frame ring for decoding video in a separate process.
+"""
+import numpy as np
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+from .capture import open_ffmpeg_capture
+
+class SharedFrameRing:
+    """
+    Fixed number of BGR frame slots in one shared memory block.
+
+    The decoder process writes frames into slots and only the slot indices
+    travel through queues, so frames are never pickled.
+    """
+    def __init__(self, n_slots: int, shape: Tuple[int, int, int], name: Optional[str] = None):
+        """
+        Create a ring, or attach to an existing one by name.
+
+        Args:
+            n_slots: Number of frame slots
+            shape: (height, width, channels) of each frame
+            name: Name of an existing ring to attach to (None to create one)
+        """
+        self.n_slots = n_slots
+        self.shape = tuple(shape)
+        size = n_slots * int(np.prod(self.shape))
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        frames = np.ndarray((n_slots, *self.shape), dtype=np.uint8, buffer=self._shm.buf)
+        self._slots: List[np.ndarray] = list(frames)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def slot(self, index: int) -> np.ndarray:
+        """Get a writable view of one slot."""
+        return self._slots[index]
+
+    def close(self) -> None:
+        """Detach from the shared memory (slot views must not be used afterwards)."""
+        self._slots = []
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory; call once, from the process that created it."""
+        self._shm.unlink()
+
+def decode_to_ring(input_path: str,
+                   hw_accel: bool,
+                   hw_decoder: Optional[str],
+                   stride: int,
+                   ring_name: str,
+                   n_slots: int,
+                   shape: Tuple[int, int, int],
+                   free_q,
+                   ready_q) -> None:
+    """
+    Decode a video into ring slots (entry point of the decoder process).
+
+    Takes a free slot index from free_q, decodes the next frame into it and
+    puts (frames grabbed, slot index) on ready_q. The slot index is None at
+    the end of the video, or the exception if decoding failed. A None from
+    free_q stops decoding early.
+
+    Args:
+        input_path: Path to input video or stream URL
+        hw_accel: Whether to request hardware decoding
+        hw_decoder: FFmpeg decoder to force if hardware acceleration is not
+            available, or None (the same fallback as the reader thread)
+        stride: Number of source frames to advance per decoded frame
+        ring_name: Name of the SharedFrameRing to decode into
+        n_slots: Number of slots in the ring
+        shape: Frame shape of the ring
+        free_q: Queue of slot indices the parent has finished with
+        ready_q: Queue of decoded slots for the parent
+    """
+    ring = SharedFrameRing(n_slots, shape, name=ring_name)
+    # The parent already reported which decoding path its own open took
+    cap = open_ffmpeg_capture(input_path, hw_accel, hw_decoder, verbose=False)
+    try:
+        while True:
+            slot = free_q.get()
+            if slot is None:
+                return
+
+            # Skip stride-1 frames with grab(), which avoids decoding them
+            grabbed = 0
+            while grabbed < stride and cap.grab():
+                grabbed += 1
+            ok = False
+            if grabbed == stride:
+                buffer = ring.slot(slot)
+                ok, frame = cap.retrieve(buffer)
+                if ok and frame is not buffer:
+                    np.copyto(buffer, frame)
+            ready_q.put((grabbed, slot if ok else None))
+            if not ok:
+                return
+    except Exception as e:
+        ready_q.put((0, e))
+    finally:
+        cap.release()
+        ring.close()
@@ -0,0 +1,204 @@
+"""
+GPU video decoding with NVIDIA's Video Processing Framework (VPF) or OpenCV's cudacodec.
+"""
+import cv2
+import torch
+from typing import Optional, Tuple
+
+class GpuVideoReader:
+    """
+    Decodes a video on NVDEC and returns frames as CUDA tensors.
+
+    Implements the subset of cv2.VideoCapture used by VideoProcessor so it can
+    be used in its place. Frames are [3, H, W] uint8 RGB tensors on the GPU.
+    """
+    def __init__(self, path: str, gpu_id: int = 0):
+        """
+        Open a video for GPU decoding.
+
+        Args:
+            path: Path to input video
+            gpu_id: CUDA device index used for decoding
+        """
+        # VPF is only needed for this backend, so import it on demand
+        try:
+            import PyNvCodec as nvc
+            import PytorchNvCodec as pnvc
+        except ImportError as e:
+            raise ImportError(
+                "The 'vpf' video backend requires NVIDIA VPF (PyNvCodec and PytorchNvCodec)"
+            ) from e
+
+        self._pnvc = pnvc
+        self._decoder = nvc.PyNvDecoder(path, gpu_id)
+        self.width = self._decoder.Width()
+        self.height = self._decoder.Height()
+
+        # NV12 -> RGB -> planar RGB, all on the GPU
+        self._to_rgb = nvc.PySurfaceConverter(
+            self.width, self.height, nvc.PixelFormat.NV12, nvc.PixelFormat.RGB, gpu_id)
+        self._to_planar = nvc.PySurfaceConverter(
+            self.width, self.height, nvc.PixelFormat.RGB, nvc.PixelFormat.RGB_PLANAR, gpu_id)
+        self._cc_ctx = nvc.ColorspaceConversionContext(nvc.ColorSpace.BT_601, nvc.ColorRange.MPEG)
+
+        self._properties = {
+            cv2.CAP_PROP_FPS: self._decoder.Framerate(),
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+            cv2.CAP_PROP_FRAME_COUNT: self._decoder.Numframes(),
+        }
+        self._surface = None
+        self._opened = True
+        print(f"Decoding on GPU {gpu_id} with VPF.")
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def get(self, prop_id: int) -> float:
+        """Get a video property using cv2.CAP_PROP_* IDs (0 if unknown)."""
+        return float(self._properties.get(prop_id, 0))
+
+    def grab(self) -> bool:
+        """
+        Decode the next frame on the GPU.
+
+        Returns:
+            False at the end of the video
+        """
+        surface = self._decoder.DecodeSingleSurface()
+        self._surface = None if surface.Empty() else surface
+        return self._surface is not None
+
+    def retrieve(self, image=None) -> Tuple[bool, Optional[torch.Tensor]]:
+        """
+        Convert the last grabbed frame to an RGB tensor.
+
+        Args:
+            image: Ignored; present for cv2.VideoCapture compatibility
+
+        Returns:
+            Tuple of (success, [3, H, W] uint8 tensor)
+        """
+        if self._surface is None:
+            return False, None
+        rgb = self._to_rgb.Execute(self._surface, self._cc_ctx)
+        planar = self._to_planar.Execute(rgb, self._cc_ctx)
+        if planar.Empty():
+            return False, None
+
+        plane = planar.PlanePtr()
+        tensor = self._pnvc.makefromDevicePtrUint8(
+            plane.GpuMem(), plane.Width(), plane.Height(), plane.Pitch(), plane.ElemSize())
+        tensor.resize_(3, self.height, self.width)
+        # The tensor aliases VPF's conversion surface, which the next frame reuses
+        return True, tensor.clone()
+
+    def read(self) -> Tuple[bool, Optional[torch.Tensor]]:
+        """Grab and retrieve the next frame."""
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self) -> None:
+        """Release the decoder."""
+        self._surface = None
+        self._decoder = None
+        self._opened = False
+
+
+class _GpuMatView:
+    """
+    Exposes a cv2.cuda_GpuMat to torch through __cuda_array_interface__.
+
+    Holds a reference to the GpuMat so its memory outlives the view.
+    """
+    def __init__(self, mat, shape: Tuple[int, ...], strides: Tuple[int, ...]):
+        self._mat = mat
+        self.__cuda_array_interface__ = {
+            "shape": shape,
+            "strides": strides,
+            "typestr": "|u1",
+            "data": (mat.cudaPtr(), False),
+            "version": 2,
+        }
+
+class CudaCodecVideoReader:
+    """
+    Decodes a video with OpenCV's cudacodec and returns frames as CUDA tensors.
+
+    Same interface and frame format as GpuVideoReader: [3, H, W] uint8 RGB
+    tensors on the GPU. Needs an OpenCV build with CUDA and NVCUVID.
+    """
+    def __init__(self, path: str, gpu_id: int = 0):
+        """
+        Open a video for GPU decoding.
+
+        Args:
+            path: Path to input video
+            gpu_id: CUDA device index used for decoding
+        """
+        if not hasattr(cv2, "cudacodec") or cv2.cuda.getCudaEnabledDeviceCount() == 0:
+            raise ImportError(
+                "The 'cudacodec' video backend requires OpenCV built with CUDA and NVCUVID"
+            )
+
+        cv2.cuda.setDevice(gpu_id)
+        self._device = torch.device("cuda", gpu_id)
+        self._reader = cv2.cudacodec.createVideoReader(path)
+        info = self._reader.format()
+        self.width = info.width
+        self.height = info.height
+        self._frame = None
+        self._opened = True
+        print(f"Decoding on GPU {gpu_id} with OpenCV cudacodec.")
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def get(self, prop_id: int) -> float:
+        """Get a video property using cv2.CAP_PROP_* IDs (0 if unknown)."""
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        ok, value = self._reader.get(prop_id)
+        return float(value) if ok else 0.0
+
+    def grab(self) -> bool:
+        """
+        Decode the next frame on the GPU.
+
+        Returns:
+            False at the end of the video
+        """
+        return self._reader.grab()
+
+    def retrieve(self, image=None) -> Tuple[bool, Optional[torch.Tensor]]:
+        """
+        Convert the last grabbed frame to an RGB tensor.
+
+        Args:
+            image: Ignored; present for cv2.VideoCapture compatibility
+
+        Returns:
+            Tuple of (success, [3, H, W] uint8 tensor)
+        """
+        ok, mat = self._reader.retrieve()
+        if not ok:
+            return False, None
+
+        # Frames are BGRA; view them in place and reorder into a new planar RGB tensor
+        view = _GpuMatView(mat, (self.height, self.width, 4), (mat.step, 4, 1))
+        bgra = torch.as_tensor(view, device=self._device)
+        return True, bgra[..., [2, 1, 0]].permute(2, 0, 1).contiguous()
+
+    def read(self) -> Tuple[bool, Optional[torch.Tensor]]:
+        """Grab and retrieve the next frame."""
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self) -> None:
+        """Release the decoder."""
+        self._reader = None
+        self._opened = False
@@ -1,7 +1,9 @@
 from typing import List, Tuple, Dict, Set
 from dataclasses import dataclass
 from datetime import datetime
-from .tracker import TrackedObject
+import time
+import numpy as np
+from .tracker import TrackBatch
 from .utils import line_intersection
 from .config import AppConfig
 
@@ -9,11 +11,17 @@ from .config import AppConfig
 class CrossingEvent:
     """Data structure for a line crossing event."""
     track_id: int
-    timestamp: str
+    timestamp: int  # Wall-clock time in nanoseconds since the epoch
     direction: str  # "up", "down", "left", "right"
     class_name: str
     centroid: Tuple[float, float]
 
+    def iso(self) -> str:
+        """Format the timestamp as local time with millisecond precision."""
+        seconds, nanos = divmod(self.timestamp, 1_000_000_000)
+        moment = datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000)
+        return moment.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
 class LineCounter:
     """
     Detects and counts objects crossing a virtual line.
@@ -30,9 +38,22 @@ class LineCounter:
         self.line_start = (x1, y1)
         self.line_end = (x2, y2)
         self.direction_type = config.line.direction
+        # Vertical motion is measured on y, horizontal on x; labels are (decreasing, increasing)
+        vertical = self.direction_type == "vertical"
+        self._axis = 1 if vertical else 0
+        self._labels = ("up", "down") if vertical else ("left", "right")
+        
+        self._line_coords = (float(x1), float(y1), float(x2), float(y2))
+        
+        # Line equation a*x + b*y + c = 0; the sign tells which side a point is on
+        self._line_a = float(y1 - y2)
+        self._line_b = float(x2 - x1)
+        self._line_c = -(self._line_a * x1 + self._line_b * y1)
         
-        # Track previous positions
-        self.previous_positions: Dict[int, Tuple[float, float]] = {}
+        # Track previous positions and line sides: one row per track ID in growable arrays
+        self._track_rows: Dict[int, int] = {}
+        self._prev_positions = np.zeros((64, 2), dtype=np.float64)
+        self._prev_sides = np.zeros(64, dtype=bool)
         
         # Track which IDs have already crossed (to prevent double counting)
         self.crossed_ids: Set[int] = set()
@@ -48,31 +69,69 @@ class LineCounter:
         
         print(f"Line counter initialized with line from {self.line_start} to {self.line_end}")
 
-    def update(self, tracked_objects: List[TrackedObject]) -> None:
+    def update(self, tracked_objects: TrackBatch) -> None:
         """
         Update the counter with new tracked objects.
         
         Args:
-            tracked_objects: List of tracked objects from the current frame
+            tracked_objects: TrackBatch from the current frame
         """
-        for obj in tracked_objects:
-            track_id = obj.track_id
-            current_pos = obj.centroid
-            
-            # If we have a previous position, check for crossing
-            if track_id in self.previous_positions:
-                prev_pos = self.previous_positions[track_id]
-                
-                # Check if the trajectory crosses the line
-                if line_intersection(prev_pos, current_pos, self.line_start, self.line_end):
-                    # Only count if this ID hasn't crossed yet
-                    if track_id not in self.crossed_ids:
-                        direction = self._determine_direction(prev_pos, current_pos)
-                        self._record_crossing(track_id, direction, obj.class_name, current_pos)
-                        self.crossed_ids.add(track_id)
-            
-            # Update previous position
-            self.previous_positions[track_id] = current_pos
+        n = len(tracked_objects)
+        if n == 0:
+            return
+        
+        track_ids = tracked_objects.track_id.tolist()
+        current = tracked_objects.centroids.astype(np.float64)
+        
+        # Look up each track's storage row; new tracks have no previous position
+        rows = np.empty(n, dtype=np.intp)
+        has_prev = np.ones(n, dtype=bool)
+        for i, track_id in enumerate(track_ids):
+            row = self._track_rows.get(track_id)
+            if row is None:
+                row = self._track_rows[track_id] = len(self._track_rows)
+                has_prev[i] = False
+            rows[i] = row
+        self._reserve(len(self._track_rows))
+        
+        # Only tracks that switched sides of the (infinite) line can have crossed it
+        sides = (self._line_a * current[:, 0] + self._line_b * current[:, 1] + self._line_c) > 0
+        switched = has_prev & (sides != self._prev_sides[rows])
+        
+        for i in np.flatnonzero(switched):
+            track_id = track_ids[i]
+            # Only count if this ID hasn't crossed yet
+            if track_id in self.crossed_ids:
+                continue
+            px, py = self._prev_positions[rows[i]]
+            cx, cy = float(current[i, 0]), float(current[i, 1])
+            # Full segment test rejects crossings outside the line's extent
+            if not line_intersection(px, py, cx, cy, *self._line_coords):
+                continue
+            prev_pos = (px, py)
+            current_pos = (cx, cy)
+            direction = self._determine_direction(prev_pos, current_pos)
+            class_name = tracked_objects.names[int(tracked_objects.cls[i])]
+            self._record_crossing(track_id, direction, class_name, current_pos)
+            self.crossed_ids.add(track_id)
+        
+        # Update previous positions
+        self._prev_positions[rows] = current
+        self._prev_sides[rows] = sides
+    
+    def _reserve(self, size: int) -> None:
+        """Grow the previous-position storage to hold at least `size` rows."""
+        capacity = len(self._prev_positions)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        grown = np.zeros((capacity, 2), dtype=np.float64)
+        grown[:len(self._prev_positions)] = self._prev_positions
+        self._prev_positions = grown
+        grown_sides = np.zeros(capacity, dtype=bool)
+        grown_sides[:len(self._prev_sides)] = self._prev_sides
+        self._prev_sides = grown_sides
     
     def _determine_direction(self, 
                             prev_pos: Tuple[float, float], 
@@ -87,18 +146,7 @@ class LineCounter:
         Returns:
             Direction string: "up", "down", "left", or "right"
         """
-        if self.direction_type == "vertical":
-            # For vertical lines, check if moving up or down
-            if current_pos[1] < prev_pos[1]:
-                return "up"
-            else:
-                return "down"
-        else:  # horizontal
-            # For horizontal lines, check if moving left or right
-            if current_pos[0] < prev_pos[0]:
-                return "left"
-            else:
-                return "right"
+        return self._labels[int(current_pos[self._axis] >= prev_pos[self._axis])]
     
     def _record_crossing(self, 
                         track_id: int, 
@@ -117,7 +165,7 @@ class LineCounter:
         # Create event
         event = CrossingEvent(
             track_id=track_id,
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+            timestamp=time.time_ns(),
             direction=direction,
             class_name=class_name,
             centroid=centroid
@@ -157,7 +205,7 @@ class LineCounter:
     
     def reset(self) -> None:
         """Reset all counters and tracking data."""
-        self.previous_positions.clear()
+        self._track_rows.clear()
         self.crossed_ids.clear()
         self.crossing_events.clear()
         self.count_up = 0
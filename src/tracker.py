@@ -1,11 +1,15 @@
 from deep_sort_realtime.deepsort_tracker import DeepSort
 import numpy as np
-import cv2
-from typing import List, Tuple, Dict
+from typing import TYPE_CHECKING, Deque, Iterator, List, Optional, Tuple, Dict
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import cached_property
 from .config import AppConfig
-from .detector import Detection
+from .detector import DetectionBatch
+from .utils import calculate_centroids
+
+if TYPE_CHECKING:
+    from .line_counter import LineCounter
 
 @dataclass
 class TrackedObject:
@@ -17,6 +21,38 @@ class TrackedObject:
     class_name: str
     centroid: Tuple[float, float]
 
+@dataclass
+class TrackBatch:
+    """Struct-of-arrays container for all confirmed tracks in a frame."""
+    xyxy: np.ndarray  # [N, 4] float32 boxes as x1, y1, x2, y2
+    conf: np.ndarray  # [N] float32 confidences (0 when not matched this frame)
+    cls: np.ndarray  # [N] int32 class IDs
+    track_id: np.ndarray  # [N] int32 track IDs
+    names: Dict[int, str]  # Class ID -> class name
+
+    def __len__(self) -> int:
+        return len(self.track_id)
+
+    @cached_property
+    def centroids(self) -> np.ndarray:
+        """[N, 2] array of box centroids (computed once and shared by all users)."""
+        return calculate_centroids(self.xyxy)
+
+    def __iter__(self) -> Iterator[TrackedObject]:
+        """Yield legacy TrackedObject instances for callers that need them (drawing)."""
+        # Convert each array to Python numbers in one call, not per element
+        for track_id, bbox, confidence, class_id, centroid in zip(
+                self.track_id.tolist(), self.xyxy.tolist(), self.conf.tolist(),
+                self.cls.tolist(), self.centroids.tolist()):
+            yield TrackedObject(
+                track_id=track_id,
+                bbox=bbox,
+                confidence=confidence,
+                class_id=class_id,
+                class_name=self.names[class_id],
+                centroid=tuple(centroid)
+            )
+
 class ObjectTracker:
     """
     Wrapper for DeepSORT tracker to maintain object identities across frames.
@@ -29,6 +65,12 @@ class ObjectTracker:
             config: Application configuration object
         """
         self.config = config
+        
+        # Share the detector's GPU for re-ID embeddings unless overridden
+        embedder_gpu = config.tracker.embedder_gpu
+        if embedder_gpu is None:
+            embedder_gpu = config.model.device.lower().startswith('cuda')
+        
         self.tracker = DeepSort(
             max_age=config.tracker.max_age,
             n_init=config.tracker.n_init,
@@ -37,49 +79,63 @@ class ObjectTracker:
             max_cosine_distance=2.0, # More lenient visual matching (default is usually 0.2)
 
 
-            embedder="mobilenet",  # Using MobileNet for feature extraction
-            embedder_gpu=True  # Set to True if you have GPU
+            embedder=config.tracker.embedder,  # MobileNet by default for feature extraction
+            embedder_gpu=embedder_gpu
 
 
         )
-        # Store trajectories: {track_id: [centroid1, centroid2, ...]}
-        self.trajectories: Dict[int, List[Tuple[float, float]]] = defaultdict(list)
+        # All tracks are reported as a single generic vehicle class
+        self._class_id = 2
+        self._class_names = {self._class_id: "vehicle"}
+        
+        # Store trajectories: {track_id: deque([centroid1, centroid2, ...])}
+        # Capped to the last 30 points; older points drop off in O(1)
+        self.trajectories: Dict[int, Deque[Tuple[float, float]]] = defaultdict(
+            lambda: deque(maxlen=30))
         
         # Track all unique IDs seen (for total vehicle count)
         self.all_tracked_ids: set = set()
         
         print("Tracker initialized.")
 
-    def update(self, detections: List[Detection], frame: np.ndarray) -> List[TrackedObject]:
+    def update(self, detections: Optional[DetectionBatch], frame: np.ndarray) -> TrackBatch:
         """
         Update tracker with new detections.
         
         Args:
-            detections: List of Detection objects from the detector
+            detections: DetectionBatch from the detector, or None for a frame
+                that skipped detection (tracks are only predicted forward)
             frame: Current frame (required for DeepSORT feature extraction)
             
         Returns:
-            List of TrackedObject objects with unique IDs
+            TrackBatch with the confirmed tracks and their unique IDs
         """
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        # Convert detections to DeepSORT format
-        # DeepSORT expects: ([bbox], confidence, class_name)
-        raw_detections = []
-        for det in detections:
-            # DeepSORT expects [x, y, w, h] format
-            x1, y1, x2, y2 = det.bbox
-            w = x2 - x1
-            h = y2 - y1
-            raw_detections.append((
-                [x1, y1, w, h],
-                det.confidence,
-                "vehicle"
-            ))
-        
-        # Update tracker with frame for feature extraction
-        tracks = self.tracker.update_tracks(raw_detections, frame=frame_rgb)
+        if detections is None:
+            # Advance the motion model only. A skipped frame is not a miss: an
+            # empty update would delete every tentative track, and DeepSORT's
+            # matching gates on time_since_update, so it keeps counting updates
+            tracker = self.tracker.tracker
+            for track in tracker.tracks:
+                track.predict(tracker.kf)
+                track.time_since_update -= 1
+            tracks = tracker.tracks
+        else:
+            # Convert detections to DeepSORT format
+            # DeepSORT expects: ([x, y, w, h], confidence, class_name)
+            xywh = detections.xyxy.copy()
+            xywh[:, 2:] -= xywh[:, :2]
+            raw_detections = [
+                (bbox, confidence, "vehicle")
+                for bbox, confidence in zip(xywh.tolist(), detections.conf.tolist())
+            ]
+            
+            # Update tracker with frame for feature extraction; the embedder expects
+            # BGR (its default) and converts just the crops, so the frame is passed as-is
+            tracks = self.tracker.update_tracks(raw_detections, frame=frame)
         
-        tracked_objects = []
+        boxes = []
+        confidences = []
+        track_ids = []
         for track in tracks:
             if not track.is_confirmed():
                 continue
@@ -89,43 +145,49 @@ class ObjectTracker:
             if track.time_since_update > 1:
                 continue
 
-            track_id = track.track_id
-            ltrb = track.to_ltrb()  # [left, top, right, bottom]
-            
-            # Record this ID
+            boxes.append(track.to_ltrb())  # [left, top, right, bottom]
+            conf = track.get_det_conf() if hasattr(track, 'get_det_conf') else None
+            confidences.append(conf if conf is not None else 0.0)
+            track_ids.append(int(track.track_id))
+        
+        n = len(track_ids)
+        batch = TrackBatch(
+            xyxy=np.asarray(boxes, dtype=np.float32).reshape(n, 4),
+            conf=np.asarray(confidences, dtype=np.float32),
+            cls=np.full(n, self._class_id, dtype=np.int32),
+            track_id=np.asarray(track_ids, dtype=np.int32),
+            names=self._class_names
+        )
+        
+        # Record IDs and store trajectories
+        for track_id, centroid in zip(track_ids, batch.centroids.tolist()):
             self.all_tracked_ids.add(track_id)
-            
-            # Calculate centroid
-            centroid = (
-                (ltrb[0] + ltrb[2]) / 2,
-                (ltrb[1] + ltrb[3]) / 2
-            )
-            
-            # Store trajectory
-            self.trajectories[track_id].append(centroid)
-            
-            # Limit trajectory length to last 30 points
-            if len(self.trajectories[track_id]) > 30:
-                self.trajectories[track_id] = self.trajectories[track_id][-30:]
-            
-            # Get class information from the original detection
-            #class_name = track.get_det_class() if hasattr(track, 'get_det_class') else "unknown"
-            class_name = "vehicle"
-            # Map class name to class_id (simplified mapping)
-            #class_id_map = {"car": 2, "motorcycle": 3, "bus": 5, "truck": 7, "person": 0}
-            #class_id = class_id_map.get(class_name, 0)
-            class_id = 2
-            
-            tracked_objects.append(TrackedObject(
-                track_id=track_id,
-                bbox=[ltrb[0], ltrb[1], ltrb[2], ltrb[3]],
-                confidence=track.get_det_conf() if hasattr(track, 'get_det_conf') else 0.0,
-                class_id=class_id,
-                class_name=class_name,
-                centroid=centroid
-            ))
+            self.trajectories[track_id].append(tuple(centroid))
         
-        return tracked_objects
+        return batch
+    
+    def update_and_count(self,
+                         detections: Optional[DetectionBatch],
+                         frame: np.ndarray,
+                         line_counter: "LineCounter") -> TrackBatch:
+        """
+        Update the tracker and the line counter for one frame.
+        
+        The TrackBatch's centroids are computed once, for the trajectories,
+        and reused by the line counter.
+        
+        Args:
+            detections: DetectionBatch from the detector, or None for a frame
+                that skipped detection
+            frame: Current frame (required for DeepSORT feature extraction)
+            line_counter: Line counter to update with the new tracks
+            
+        Returns:
+            TrackBatch with the confirmed tracks and their unique IDs
+        """
+        batch = self.update(detections, frame)
+        line_counter.update(batch)
+        return batch
     
     def get_trajectory(self, track_id: int) -> List[Tuple[float, float]]:
         """
@@ -137,7 +199,7 @@ class ObjectTracker:
         Returns:
             List of (x, y) centroids representing the object's path
         """
-        return self.trajectories.get(track_id, [])
+        return list(self.trajectories.get(track_id, ()))
     
     def get_total_vehicle_count(self) -> int:
         """
@@ -4,6 +4,7 @@ Helper utilities for the vehicle detection system.
 import numpy as np
 from typing import Tuple, List
 import cv2
+from numba import njit
 
 def calculate_centroid(bbox: List[float]) -> Tuple[float, float]:
     """
@@ -18,29 +19,59 @@ def calculate_centroid(bbox: List[float]) -> Tuple[float, float]:
     x1, y1, x2, y2 = bbox
     return ((x1 + x2) / 2, (y1 + y2) / 2)
 
-def line_intersection(p1: Tuple[float, float], 
-                      p2: Tuple[float, float],
-                      line_start: Tuple[float, float],
-                      line_end: Tuple[float, float]) -> bool:
+def calculate_centroids(xyxy: np.ndarray) -> np.ndarray:
     """
-    Check if line segment p1-p2 intersects with line segment line_start-line_end.
+    Calculate the centroids of many bounding boxes at once.
     
     Args:
-        p1: First point of trajectory segment (x, y)
-        p2: Second point of trajectory segment (x, y)
-        line_start: Start point of counting line (x, y)
-        line_end: End point of counting line (x, y)
+        xyxy: Bounding boxes as an [N, 4] array of x1, y1, x2, y2
         
     Returns:
-        True if segments intersect, False otherwise
+        [N, 2] array of (center_x, center_y)
+    """
+    return (xyxy[:, :2] + xyxy[:, 2:]) / 2
+
+@njit(inline='always')
+def _ccw(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> bool:
+    return (cy - ay) * (bx - ax) > (by - ay) * (cx - ax)
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def line_intersection(p1x: float, p1y: float,
+                      p2x: float, p2y: float,
+                      lsx: float, lsy: float,
+                      lex: float, ley: float) -> bool:
     """
-    def ccw(A, B, C):
-        return (C[1] - A[1]) * (B[0] - A[0]) > (B[1] - A[1]) * (C[0] - A[0])
+    Check if line segment p1-p2 intersects with line segment line_start-line_end.
     
-    A, B = p1, p2
-    C, D = line_start, line_end
+    Compiled with numba; takes plain floats instead of point tuples.
     
-    return ccw(A, C, D) != ccw(B, C, D) and ccw(A, B, C) != ccw(A, B, D)
+    Args:
+        p1x, p1y: First point of trajectory segment
+        p2x, p2y: Second point of trajectory segment
+        lsx, lsy: Start point of counting line
+        lex, ley: End point of counting line
+        
+    Returns:
+        True if segments intersect, False otherwise
+    """
+    return (_ccw(p1x, p1y, lsx, lsy, lex, ley) != _ccw(p2x, p2y, lsx, lsy, lex, ley) and
+            _ccw(p1x, p1y, p2x, p2y, lsx, lsy) != _ccw(p1x, p1y, p2x, p2y, lex, ley))
+
+# BGR color per class ID
+CLASS_COLORS = {
+    0: (255, 0, 0),      # person - blue
+    2: (0, 255, 0),      # car - green
+    3: (0, 255, 255),    # motorcycle - yellow
+    5: (0, 0, 255),      # bus - red
+    7: (255, 0, 255),    # truck - magenta
+}
+DEFAULT_CLASS_COLOR = (200, 200, 200)
+
+# CLASS_COLORS as a lookup table indexed by class ID, for the draw kernel
+CLASS_COLOR_LUT = np.full((256, 3), DEFAULT_CLASS_COLOR, dtype=np.int32)
+for _class_id, _color in CLASS_COLORS.items():
+    CLASS_COLOR_LUT[_class_id] = _color
+del _class_id, _color
 
 def get_color_for_class(class_id: int) -> Tuple[int, int, int]:
     """
@@ -52,14 +83,40 @@ def get_color_for_class(class_id: int) -> Tuple[int, int, int]:
     Returns:
         BGR color tuple
     """
-    colors = {
-        0: (255, 0, 0),      # person - blue
-        2: (0, 255, 0),      # car - green
-        3: (0, 255, 255),    # motorcycle - yellow
-        5: (0, 0, 255),      # bus - red
-        7: (255, 0, 255),    # truck - magenta
-    }
-    return colors.get(class_id, (200, 200, 200))
+    return CLASS_COLORS.get(class_id, DEFAULT_CLASS_COLOR)
+
+@njit(cache=True, boundscheck=False)
+def prepare_box_draws(xyxy: np.ndarray,
+                      cls: np.ndarray,
+                      color_lut: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a frame's boxes to integer draw coordinates and colors.
+    
+    Compiled with numba so per-object casting and color lookup happen in
+    one pass instead of in the Python draw loop.
+    
+    Args:
+        xyxy: [N, 4] float boxes as x1, y1, x2, y2
+        cls: [N] integer class IDs
+        color_lut: [K, 3] BGR colors indexed by class ID; IDs outside
+            the table use the last entry
+        
+    Returns:
+        Tuple of ([N, 4] int32 boxes, [N, 3] int32 BGR colors)
+    """
+    n = xyxy.shape[0]
+    boxes = np.empty((n, 4), dtype=np.int32)
+    colors = np.empty((n, 3), dtype=np.int32)
+    last = color_lut.shape[0] - 1
+    for i in range(n):
+        for j in range(4):
+            boxes[i, j] = np.int32(xyxy[i, j])
+        class_id = cls[i]
+        if class_id < 0 or class_id > last:
+            class_id = last
+        for j in range(3):
+            colors[i, j] = color_lut[class_id, j]
+    return boxes, colors
 
 def draw_text_with_background(frame: np.ndarray, 
                                text: str, 
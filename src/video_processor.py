@@ -1,16 +1,51 @@
 import cv2
+import multiprocessing as mp
 import numpy as np
 import os
-from typing import Optional
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
 from tqdm import tqdm
 from .config import AppConfig
-from .detector import ObjectDetector
-from .tracker import ObjectTracker
+from .detector import ObjectDetector, BatchedDetector
+from .tracker import ObjectTracker, TrackBatch
 from .line_counter import LineCounter
-from .utils import get_color_for_class, draw_text_with_background
+from .gpu_reader import CudaCodecVideoReader, GpuVideoReader
+from .capture import open_ffmpeg_capture
+from .frame_ring import SharedFrameRing, decode_to_ring
+from .utils import (CLASS_COLOR_LUT, draw_text_with_background, line_intersection,
+                    prepare_box_draws)
 
-# Set higher FFmpeg read attempts for videos with multiple streams
-os.environ['OPENCV_FFMPEG_READ_ATTEMPTS'] = '100000'
+# FFmpeg settings for network streams only; local files open faster without them
+STREAM_FFMPEG_ENV = {
+    'OPENCV_FFMPEG_READ_ATTEMPTS': '100000',  # Increased for multi-stream videos
+}
+RTSP_FFMPEG_ENV = {
+    'OPENCV_FFMPEG_CAPTURE_OPTIONS': 'rtsp_transport;udp',
+}
+
+# RTSP ingest with hardware decoding; appsink keeps only the newest frame
+GSTREAMER_RTSP_PIPELINE = (
+    "rtspsrc location={location} latency=0 ! rtph264depay ! h264parse ! "
+    "nvv4l2decoder ! nvvidconv ! video/x-raw,format=BGRx ! "
+    "videoconvert ! video/x-raw,format=BGR ! "
+    "appsink max-buffers=1 drop=true sync=false"
+)
+
+# Top-left region reserved for the statistics panel (height, width)
+STATS_PANEL_SIZE = (200, 400)
+
+# Largest frame shown in the display window (width, height); output keeps full resolution
+DISPLAY_MAX_SIZE = (1280, 720)
+
+# Source frames between progress bar updates
+PROGRESS_UPDATE_FRAMES = 30
+
+# Decode buffers kept for reuse; covers the frames in flight between the queues
+FRAME_POOL_SIZE = 32
+
+# Shared memory slots between the decoder process and the reader thread
+FRAME_RING_SLOTS = 4
 
 class VideoProcessor:
     """
@@ -30,6 +65,32 @@ class VideoProcessor:
         self.detector = ObjectDetector(config)
         self.tracker = ObjectTracker(config)
         self.line_counter = LineCounter(config)
+        
+        # Visualization settings are fixed for the whole video
+        vis_config = config.visualization
+        x1, y1, x2, y2 = config.line.coordinates
+        self._line_pt1 = (int(x1), int(y1))
+        self._line_pt2 = (int(x2), int(y2))
+        self._line_color = tuple(vis_config.line_color)
+        self._line_thickness = vis_config.line_thickness
+        self._box_thickness = vis_config.box_thickness
+        self._text_color = tuple(vis_config.text_color)
+        
+        # Stats panel rows: the total first, then one row per crossing direction
+        directions = [key for key in self.line_counter.get_statistics() if key != 'total']
+        self._stats_rows = [
+            (key, f"Crossed {key.capitalize()}: ", (10, 70 + 30 * row))
+            for row, key in enumerate(directions)
+        ]
+        # Stats panel image and the mask of pixels it covers, redrawn only when counts change
+        self._panel = np.zeros((*STATS_PANEL_SIZE, 3), dtype=np.uint8)
+        self._panel_mask = np.zeros((*STATS_PANEL_SIZE, 1), dtype=bool)
+        self._panel_key = None
+        
+        # Compile the numba kernels now so the first crossing/draw doesn't stall a frame
+        line_intersection(0.0, 0.0, 1.0, 1.0, 0.0, 1.0, 1.0, 0.0)
+        prepare_box_draws(np.zeros((1, 4), dtype=np.float32), np.zeros(1, dtype=np.int32),
+                          CLASS_COLOR_LUT)
         print("Video processor ready.")
     
     def process_video(self, 
@@ -49,7 +110,7 @@ class VideoProcessor:
         print(f"Processing video: {input_path}")
         
         # Open video
-        cap = cv2.VideoCapture(input_path)
+        cap = self._open_capture(input_path)
         if not cap.isOpened():
             raise ValueError(f"Could not open video: {input_path}")
         
@@ -59,54 +120,137 @@ class VideoProcessor:
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
+        # Live streams may not report FPS or length
+        if fps <= 0:
+            fps = self.config.video.fps
+        if total_frames < 0:
+            total_frames = 0
+        
         print(f"Video properties: {width}x{height} @ {fps} FPS, {total_frames} frames")
         
+        # Only every Nth frame is decoded and analyzed
+        stride = max(1, self.config.video.frame_stride)
+        if stride > 1:
+            print(f"Frame stride: processing every {stride} frames")
+        
         # Initialize video writer if saving output
         writer = None
         if self.config.video.save_output:
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+            # Keep real-time playback speed when frames are skipped
+            writer = self._open_writer(output_path, fps / stride, (width, height))
             print(f"Output will be saved to: {output_path}")
         
+        # Frames are buffered and detected in batches
+        batcher = BatchedDetector(
+            self.detector, self.config.model.batch_size, self.config.model.detect_every)
+        
+        # Decode, draw and encode on their own threads so they overlap with
+        # detection instead of adding to it
+        frame_q = queue.Queue(maxsize=8)
+        viz_q = queue.Queue(maxsize=8)
+        # Encoding time varies most per frame, so give the writer the deepest buffer
+        write_q = queue.Queue(maxsize=16) if writer is not None else None
+        # Only the newest annotated frame is shown; imshow stays on this thread
+        display_q = queue.Queue(maxsize=1)
+        # Written frames go back to the reader to decode into, so decoding doesn't
+        # allocate a new frame each time. Not used with the display, which may
+        # still be showing a frame after it has been written.
+        frame_pool = None
+        if writer is not None and not self.config.video.show_display:
+            frame_pool = queue.Queue(maxsize=FRAME_POOL_SIZE)
+        stop = threading.Event()
+        # Exceptions raised on the viz and writer threads, re-raised on this thread
+        errors: List[BaseException] = []
+        if self._use_reader_process():
+            # The decoder process opens its own capture. The input is therefore
+            # opened twice (a network stream connects twice): once here for its
+            # properties, which size the shared frame ring, and once in the child
+            cap.release()
+            reader_thread = threading.Thread(
+                target=self._ring_reader_loop,
+                args=(input_path, stride, (height, width, 3), frame_q, stop, frame_pool),
+                daemon=True)
+        else:
+            reader_thread = threading.Thread(
+                target=self._reader_loop, args=(cap, stride, frame_q, stop, frame_pool), daemon=True)
+        reader_thread.start()
+        writer_thread = None
+        if writer is not None:
+            writer_thread = threading.Thread(
+                target=self._writer_loop, args=(writer, write_q, errors, frame_pool),
+                name="writer", daemon=True)
+            writer_thread.start()
+        viz_thread = threading.Thread(
+            target=self._viz_loop, args=(viz_q, write_q, writer_thread, errors, display_q),
+            name="viz", daemon=True)
+        viz_thread.start()
+        
         # Process frames
-        frame_count = 0
+        frame_count = 0  # Index into the source video (includes skipped frames)
+        frames_processed = 0
         frames_written = 0
-        with tqdm(total=total_frames, desc="Processing") as pbar:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                frame_count += 1
-                
-                # Run detection
-                detections = self.detector.detect(frame)
-                
-                # Update tracker with frame
-                tracked_objects = self.tracker.update(detections, frame)
-                
-                # Update line counter
-                self.line_counter.update(tracked_objects)
-                
-                # Visualize
-                annotated_frame = self._visualize(frame, tracked_objects)
-                
-                # Write frame if saving (do this BEFORE display to ensure all frames are written)
-                if writer is not None:
-                    writer.write(annotated_frame)
-                    frames_written += 1
-                
-                # Show display if enabled
-                if self.config.video.show_display:
-                    cv2.imshow('Vehicle Detection', annotated_frame)
-                    # Don't break on 'q' - just close the window but continue processing
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == ord('q'):
-                        print("\nDisplay closed by user. Processing continues...")
-                        cv2.destroyAllWindows()
-                        self.config.video.show_display = False  # Disable further display
-                
-                pbar.update(1)
+        try:
+            with tqdm(total=total_frames or None, desc="Processing") as pbar:
+                while True:
+                    grabbed, frame = frame_q.get()
+                    if isinstance(frame, Exception):
+                        raise frame
+                    frame_count += grabbed
+                    # Update the bar in chunks rather than on every frame
+                    if frame_count - pbar.n >= PROGRESS_UPDATE_FRAMES or frame is None:
+                        pbar.update(frame_count - pbar.n)
+                    if frame is not None:
+                        batcher.submit(frame)
+                    
+                    # Run detection once the batch is full or the video has ended
+                    if batcher.full or (frame is None and len(batcher) > 0):
+                        batch_frames = batcher.frames
+                        for batch_frame, detections in zip(batch_frames, batcher.flush()):
+                            frames_processed += 1
+                            
+                            # Update tracker with frame, then the line counter
+                            tracked_objects = self.tracker.update_and_count(
+                                detections, batch_frame, self.line_counter)
+                            
+                            # Visualize on the viz thread; the counts are snapshotted
+                            # now since tracking moves on before the frame is drawn
+                            self._put_stage(viz_q, (batch_frame, tracked_objects,
+                                                    self.line_counter.get_statistics(),
+                                                    self.tracker.get_total_vehicle_count()),
+                                            viz_thread, errors)
+                            if errors:
+                                raise errors[0]
+                            if writer_thread is not None:
+                                frames_written += 1
+                            
+                            # Show display if enabled
+                            if self.config.video.show_display:
+                                try:
+                                    cv2.imshow('Vehicle Detection', display_q.get_nowait())
+                                except queue.Empty:
+                                    pass
+                                # Don't break on 'q' - just close the window but continue processing
+                                # pollKey handles GUI events without waitKey's 1 ms sleep
+                                key = cv2.pollKey() & 0xFF
+                                if key == ord('q'):
+                                    print("\nDisplay closed by user. Processing continues...")
+                                    cv2.destroyAllWindows()
+                                    self.config.video.show_display = False  # Disable further display
+                    
+                    if frame is None:
+                        break
+        finally:
+            # Stop the reader, draining the queue in case it is blocked on a full one
+            stop.set()
+            while reader_thread.is_alive():
+                try:
+                    frame_q.get_nowait()
+                except queue.Empty:
+                    reader_thread.join(timeout=0.1)
+            # Let the viz and writer threads finish the queued frames
+            self._finish_stage(viz_q, viz_thread)
+            if writer_thread is not None:
+                self._finish_stage(write_q, writer_thread)
         
         # Cleanup
         cap.release()
@@ -115,53 +259,436 @@ class VideoProcessor:
         if self.config.video.show_display:
             cv2.destroyAllWindows()
         
+        # A stage may have failed after the last frame was queued
+        if errors:
+            raise errors[0]
+        
         # Verify frame counts
-        print(f"\n✅ Frames processed: {frame_count}/{total_frames}")
+        print(f"\n✅ Frames read: {frame_count}/{total_frames}")
+        print(f"✅ Frames processed: {frames_processed}")
         if writer:
             print(f"✅ Frames written to output: {frames_written}")
         
         # Print statistics
         self._print_statistics()
     
-    def _visualize(self, frame: np.ndarray, tracked_objects: list) -> np.ndarray:
+    def _reader_loop(self,
+                     cap,
+                     stride: int,
+                     frame_q: queue.Queue,
+                     stop: threading.Event,
+                     frame_pool: Optional[queue.Queue] = None) -> None:
         """
-        Draw visualizations on the frame.
+        Decode frames ahead of the detector (runs on the reader thread).
+        
+        Puts (frames grabbed, frame) tuples on frame_q. The frame is None at
+        the end of the video, or the exception if reading failed.
+        
+        Args:
+            cap: Opened VideoCapture or GPU reader
+            stride: Number of source frames to advance per decoded frame
+            frame_q: Queue consumed by process_video
+            stop: Set by process_video to stop reading early
+            frame_pool: Optional queue of written frames to decode into
+        """
+        try:
+            while not stop.is_set():
+                buffer = self._pooled_buffer(frame_pool)
+                grabbed, frame = self._read_frame(cap, stride, buffer)
+                frame_q.put((grabbed, frame))
+                if frame is None:
+                    return
+        except Exception as e:
+            frame_q.put((0, e))
+    
+    def _ring_reader_loop(self,
+                          input_path: str,
+                          stride: int,
+                          shape: Tuple[int, int, int],
+                          frame_q: queue.Queue,
+                          stop: threading.Event,
+                          frame_pool: Optional[queue.Queue] = None) -> None:
+        """
+        Decode frames in a separate process (runs on the reader thread).
+        
+        The process decodes into a SharedFrameRing and only slot indices are
+        passed back, so frames are not pickled. Each slot is copied out and
+        released right away since frames outlive the ring slot downstream.
+        Puts the same (frames grabbed, frame) tuples on frame_q as _reader_loop.
         
         Args:
-            frame: Input frame
-            tracked_objects: List of TrackedObject instances
+            input_path: Path to input video or stream URL
+            stride: Number of source frames to advance per decoded frame
+            shape: (height, width, 3) of the decoded frames
+            frame_q: Queue consumed by process_video
+            stop: Set by process_video to stop reading early
+            frame_pool: Optional queue of written frames to copy into
+        """
+        # Spawn so the decoder doesn't inherit torch/CUDA state from this process
+        ctx = mp.get_context("spawn")
+        ring = SharedFrameRing(FRAME_RING_SLOTS, shape)
+        free_q = ctx.Queue()
+        ready_q = ctx.Queue()
+        for slot in range(FRAME_RING_SLOTS):
+            free_q.put(slot)
+        decoder = ctx.Process(
+            target=decode_to_ring,
+            args=(input_path, self.config.video.hw_accel, self.config.video.hw_decoder,
+                  stride, ring.name, FRAME_RING_SLOTS, shape, free_q, ready_q),
+            daemon=True)
+        decoder.start()
+        print("Decoding in a separate process.")
+        
+        try:
+            while not stop.is_set():
+                try:
+                    grabbed, slot = ready_q.get(timeout=1.0)
+                except queue.Empty:
+                    if not decoder.is_alive():
+                        raise RuntimeError("Decoder process exited unexpectedly")
+                    continue
+                if isinstance(slot, Exception):
+                    raise slot
+                
+                frame = None
+                if slot is not None:
+                    frame = self._pooled_buffer(frame_pool)
+                    if frame is None or frame.shape != shape:
+                        frame = np.empty(shape, dtype=np.uint8)
+                    np.copyto(frame, ring.slot(slot))
+                    free_q.put(slot)
+                frame_q.put((grabbed, frame))
+                if frame is None:
+                    return
+        except Exception as e:
+            frame_q.put((0, e))
+        finally:
+            # Stop the decoder if it is still running, then free the ring
+            free_q.put(None)
+            decoder.join(timeout=5)
+            if decoder.is_alive():
+                decoder.terminate()
+                decoder.join()
+            ring.close()
+            ring.unlink()
+    
+    def _pooled_buffer(self, frame_pool: Optional[queue.Queue]) -> Optional[np.ndarray]:
+        """Take a recycled frame from the pool, or None if there is none."""
+        if frame_pool is None:
+            return None
+        try:
+            return frame_pool.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def _viz_loop(self,
+                  viz_q: queue.Queue,
+                  write_q: Optional[queue.Queue],
+                  writer_thread: Optional[threading.Thread],
+                  errors: List[BaseException],
+                  display_q: queue.Queue) -> None:
+        """
+        Annotate frames until a None sentinel (runs on the viz thread).
+        
+        If annotating fails the exception is appended to errors and the thread
+        stops; process_video notices through _put_stage.
+        
+        Args:
+            viz_q: Queue of (frame, tracked objects, stats, total vehicles) tuples
+            write_q: Writer queue for annotated frames, or None if not saving
+            writer_thread: Thread consuming write_q, or None if not saving
+            errors: List that failed stages append their exception to
+            display_q: Single-slot queue holding the newest frame to display
+        """
+        try:
+            while True:
+                item = viz_q.get()
+                if item is None:
+                    return
+                annotated_frame = self._visualize(*item)
+                if write_q is not None:
+                    self._put_stage(write_q, annotated_frame, writer_thread, errors)
+                if self.config.video.show_display:
+                    # Replace a frame the display has not picked up yet
+                    try:
+                        display_q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    display_q.put_nowait(self._display_frame(annotated_frame))
+        except Exception as e:
+            # The writer's own error is already recorded
+            if e not in errors:
+                errors.append(e)
+    
+    def _display_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Downscale a frame to fit within DISPLAY_MAX_SIZE, keeping its aspect ratio.
+        
+        Args:
+            frame: Annotated frame
             
         Returns:
-            Annotated frame
+            Resized copy, or the frame itself if it already fits
+        """
+        height, width = frame.shape[:2]
+        scale = min(DISPLAY_MAX_SIZE[0] / width, DISPLAY_MAX_SIZE[1] / height)
+        if scale >= 1:
+            return frame
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    
+    def _writer_loop(self,
+                     writer: cv2.VideoWriter,
+                     write_q: queue.Queue,
+                     errors: List[BaseException],
+                     frame_pool: Optional[queue.Queue] = None) -> None:
         """
-        annotated = frame.copy()
+        Encode annotated frames until a None sentinel (runs on the writer thread).
         
-        # Draw counting line
-        line_color = tuple(self.config.visualization.line_color)
-        thickness = self.config.visualization.line_thickness
-        x1, y1, x2, y2 = self.config.line.coordinates
-        cv2.line(annotated, (int(x1), int(y1)), (int(x2), int(y2)), 
-                line_color, thickness)
-        
-        # Draw tracked objects
-        for obj in tracked_objects:
-            # Get color for this class
-            color = get_color_for_class(obj.class_id)
+        If writing fails the exception is appended to errors and the thread
+        stops; producers notice through _put_stage.
+        
+        Args:
+            writer: Opened video writer
+            write_q: Queue of annotated frames fed by the viz thread
+            errors: List that failed stages append their exception to
+            frame_pool: Optional queue to hand written frames back to the reader
+        """
+        try:
+            while True:
+                frame = write_q.get()
+                if frame is None:
+                    return
+                writer.write(frame)
+                if frame_pool is not None:
+                    try:
+                        frame_pool.put_nowait(frame)
+                    except queue.Full:
+                        pass
+        except Exception as e:
+            errors.append(e)
+    
+    def _put_stage(self,
+                   stage_q: queue.Queue,
+                   item,
+                   consumer: threading.Thread,
+                   errors: List[BaseException]) -> None:
+        """
+        Put an item on a stage's queue, giving up if the stage's thread has died.
+        
+        Args:
+            stage_q: Queue consumed by the stage
+            item: Item to queue
+            consumer: Thread running the stage
+            errors: List that failed stages append their exception to
+            
+        Raises:
+            The stage's exception, or RuntimeError if it stopped without one
+        """
+        while True:
+            try:
+                stage_q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if consumer.is_alive():
+                    continue
+                if errors:
+                    raise errors[0]
+                raise RuntimeError(f"The {consumer.name} thread stopped unexpectedly")
+    
+    def _finish_stage(self, stage_q: queue.Queue, consumer: threading.Thread) -> None:
+        """
+        Send a stage its None sentinel and wait for it to finish the queued items.
+        
+        Stops waiting if the stage's thread has already died.
+        
+        Args:
+            stage_q: Queue consumed by the stage
+            consumer: Thread running the stage
+        """
+        while consumer.is_alive():
+            try:
+                stage_q.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        consumer.join()
+    
+    def _read_frame(self,
+                    cap,
+                    stride: int,
+                    buffer: Optional[np.ndarray] = None) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        Advance the capture by `stride` frames and decode only the last one.
+        
+        Args:
+            cap: Opened VideoCapture or GPU reader
+            stride: Number of source frames to advance
+            buffer: Optional preallocated array to decode the frame into
             
+        Returns:
+            Tuple of (frames grabbed, decoded frame or None at end of video).
+            Frames from a GPU reader are CUDA tensors.
+        """
+        # Skip stride-1 frames with grab(), which avoids decoding them
+        grabbed = 0
+        for _ in range(stride - 1):
+            if not cap.grab():
+                return grabbed, None
+            grabbed += 1
+        
+        # Decode only the frame we actually analyze
+        if not cap.grab():
+            return grabbed, None
+        grabbed += 1
+        if buffer is not None:
+            ret, frame = cap.retrieve(buffer)
+        else:
+            ret, frame = cap.retrieve()
+        if not ret:
+            return grabbed, None
+        
+        # Detector, tracker and writer all expect C-contiguous HxWx3 frames; copy once
+        # here if a backend hands back a strided view (e.g. of a row-padded buffer)
+        if isinstance(frame, np.ndarray) and not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+        return grabbed, frame
+    
+    def _open_capture(self, input_path: str):
+        """
+        Open the input video with the configured backend.
+        
+        Args:
+            input_path: Path to input video or stream URL
+            
+        Returns:
+            Opened VideoCapture, or a GPU reader for the "vpf" and "cudacodec" backends
+            (check isOpened() before use)
+        """
+        backend = self.config.video.backend.lower()
+        if backend == "gstreamer" and input_path.startswith("rtsp://"):
+            print("Opening RTSP stream with GStreamer hardware pipeline.")
+            pipeline = GSTREAMER_RTSP_PIPELINE.format(location=input_path)
+            return cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if backend in ("vpf", "cudacodec"):
+            # Decode on the detector's GPU ("cuda" or "cuda:N")
+            _, _, index = self.config.model.device.partition(":")
+            reader_cls = GpuVideoReader if backend == "vpf" else CudaCodecVideoReader
+            return reader_cls(input_path, gpu_id=int(index or 0))
+        if backend not in ("ffmpeg", "gstreamer"):
+            raise ValueError(f"Unknown video backend: {self.config.video.backend}")
+        
+        self._configure_stream_env(input_path)
+        cap = open_ffmpeg_capture(
+            input_path, self.config.video.hw_accel, self.config.video.hw_decoder)
+        # Keep OpenCV from queueing stale frames ahead of the consumer
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+    
+    def _configure_stream_env(self, input_path: str) -> None:
+        """
+        Set the FFmpeg environment overrides for HTTP/RTSP inputs.
+        
+        OpenCV reads these when the capture is opened and first read, so they
+        are left in place for the stream. Values already set in the
+        environment take precedence.
+        
+        Args:
+            input_path: Path to input video or stream URL
+        """
+        scheme = input_path.split("://", 1)[0].lower() if "://" in input_path else ""
+        if scheme not in ("http", "https", "rtsp", "rtsps"):
+            return
+        
+        overrides = dict(STREAM_FFMPEG_ENV)
+        if scheme.startswith("rtsp"):
+            overrides.update(RTSP_FFMPEG_ENV)
+        for name, value in overrides.items():
+            os.environ.setdefault(name, value)
+    
+    def _use_reader_process(self) -> bool:
+        """Whether frames should be decoded in a separate process."""
+        video_config = self.config.video
+        if not video_config.reader_process:
+            return False
+        if video_config.backend.lower() != "ffmpeg":
+            print(f"reader_process is only supported with the ffmpeg backend, "
+                  f"decoding on a thread for '{video_config.backend}'.")
+            return False
+        return True
+    
+    def _open_writer(self,
+                     output_path: str,
+                     fps: float,
+                     frame_size: Tuple[int, int]) -> cv2.VideoWriter:
+        """
+        Open the output video, preferring a hardware H.264 encoder.
+        
+        Args:
+            output_path: Path to output video
+            fps: Output frame rate
+            frame_size: (width, height) of the output frames
+            
+        Returns:
+            Opened VideoWriter
+        """
+        if self.config.video.hw_encode:
+            writer = cv2.VideoWriter(
+                output_path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*'avc1'), fps, frame_size,
+                [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+            if writer.isOpened():
+                accel = int(writer.get(cv2.VIDEOWRITER_PROP_HW_ACCELERATION))
+                if accel > cv2.VIDEO_ACCELERATION_NONE:
+                    print("Hardware-accelerated H.264 encoding enabled.")
+                else:
+                    print("Hardware encoder not available, encoding H.264 on CPU.")
+                return writer
+            print("H.264 encoder not available, falling back to mp4v.")
+        
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        return cv2.VideoWriter(output_path, fourcc, fps, frame_size)
+    
+    def _visualize(self,
+                   frame: np.ndarray,
+                   tracked_objects: TrackBatch,
+                   stats: Dict[str, int],
+                   total_vehicles: int) -> np.ndarray:
+        """
+        Draw visualizations on the frame, in place.
+        
+        Args:
+            frame: Input frame (not used again after visualization)
+            tracked_objects: TrackBatch for this frame
+            stats: Line crossing statistics as of this frame
+            total_vehicles: Unique vehicles tracked as of this frame
+            
+        Returns:
+            The annotated frame (same array as the input)
+        """
+        # Draw counting line
+        cv2.line(frame, self._line_pt1, self._line_pt2,
+                self._line_color, self._line_thickness)
+        
+        # Draw tracked objects; int boxes and colors for all of them come from one kernel call
+        boxes, colors = prepare_box_draws(
+            tracked_objects.xyxy, tracked_objects.cls, CLASS_COLOR_LUT)
+        names = tracked_objects.names
+        for (x1, y1, x2, y2), color, class_id, track_id in zip(
+                boxes.tolist(), colors.tolist(),
+                tracked_objects.cls.tolist(), tracked_objects.track_id.tolist()):
             # Draw bounding box with thicker line
-            x1, y1, x2, y2 = [int(v) for v in obj.bbox]
-            cv2.rectangle(annotated, (x1, y1), (x2, y2), color, 
-                         self.config.visualization.box_thickness)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 
+                         self._box_thickness)
             
             # Draw label with larger text for better visibility
-            label = f"{obj.class_name.upper()} #{obj.track_id}"
+            label = f"{names[class_id].upper()} #{track_id}"
             draw_text_with_background(
-                annotated, 
+                frame, 
                 label, 
                 (x1, y1 - 5),
                 font_scale=0.7,  # Larger font
                 thickness=2,
-                text_color=tuple(self.config.visualization.text_color),
+                text_color=self._text_color,
                 bg_color=color
             )
             
@@ -169,42 +696,73 @@ class VideoProcessor:
             # trajectory = self.tracker.get_trajectory(obj.track_id)
             # if len(trajectory) > 1:
             #     points = np.array(trajectory, dtype=np.int32)
-            #     cv2.polylines(annotated, [points], False, color, 2)
+            #     cv2.polylines(frame, [points], False, color, 2)
         
-        # Draw statistics panel
-        stats = self.line_counter.get_statistics()
-        total_vehicles = self.tracker.get_total_vehicle_count()
+        # Draw statistics panel, re-rendering it only when the counts change
+        panel_key = (total_vehicles, tuple(stats.values()))
+        if panel_key != self._panel_key:
+            self._render_stats_panel(stats, total_vehicles)
+            self._panel_key = panel_key
+        roi = frame[:STATS_PANEL_SIZE[0], :STATS_PANEL_SIZE[1]]
+        height, width = roi.shape[:2]
+        np.copyto(roi, self._panel[:height, :width], where=self._panel_mask[:height, :width])
+        
+        return frame
+    
+    def _render_stats_panel(self, stats: Dict[str, int], total_vehicles: int) -> None:
+        """
+        Render the statistics panel into the cached panel image and mask.
         
-        y_offset = 30
+        Args:
+            stats: Line crossing statistics
+            total_vehicles: Unique vehicles tracked
+        """
+        self._panel.fill(0)
+        self._draw_stats_panel(self._panel, stats, total_vehicles)
+        
+        # The same draws in a single color mark the pixels the panel covers
+        mask = np.zeros(STATS_PANEL_SIZE, dtype=np.uint8)
+        self._draw_stats_panel(mask, stats, total_vehicles, color=(255, 255, 255))
+        self._panel_mask[..., 0] = mask > 0
+    
+    def _draw_stats_panel(self,
+                          image: np.ndarray,
+                          stats: Dict[str, int],
+                          total_vehicles: int,
+                          color: Optional[Tuple[int, int, int]] = None) -> None:
+        """
+        Draw the statistics panel text onto an image.
+        
+        Args:
+            image: Image to draw on
+            stats: Line crossing statistics
+            total_vehicles: Unique vehicles tracked
+            color: If given, draw all text and backgrounds in this color
+        """
+        text_color = color or (255, 255, 255)
         
         # Total vehicles detected
-        text = f"Total Vehicles: {total_vehicles}"
         draw_text_with_background(
-            annotated,
-            text,
-            (10, y_offset),
+            image,
+            f"Total Vehicles: {total_vehicles}",
+            (10, 30),
             font_scale=0.8,
             thickness=2,
-            text_color=(255, 255, 255),
-            bg_color=(0, 128, 0)  # Green background
+            text_color=text_color,
+            bg_color=color or (0, 128, 0)  # Green background
         )
-        y_offset += 40
         
-        # Line crossing statistics
-        for key, value in stats.items():
-            if key == 'total':
-                continue  # Skip total for line crossings, we show it separately
-            text = f"Crossed {key.capitalize()}: {value}"
+        # Line crossing statistics (total is shown separately above)
+        for key, prefix, position in self._stats_rows:
             draw_text_with_background(
-                annotated,
-                text,
-                (10, y_offset),
+                image,
+                f"{prefix}{stats[key]}",
+                position,
                 font_scale=0.7,
-                thickness=2
+                thickness=2,
+                text_color=text_color,
+                bg_color=color or (0, 0, 0)
             )
-            y_offset += 30
-        
-        return annotated
     
     def _print_statistics(self) -> None:
         """Print final statistics."""
@@ -7,7 +7,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import AppConfig
-from src.detector import ObjectDetector, Detection
+from src.detector import ObjectDetector, BatchedDetector, Detection, DetectionBatch
 
 class TestObjectDetector(unittest.TestCase):
     def setUp(self):
@@ -27,8 +27,9 @@ class TestObjectDetector(unittest.TestCase):
         # Create a black 640x640 frame
         frame = np.zeros((640, 640, 3), dtype=np.uint8)
         detections = self.detector.detect(frame)
-        self.assertIsInstance(detections, list)
+        self.assertIsInstance(detections, DetectionBatch)
         self.assertEqual(len(detections), 0)
+        self.assertEqual(detections.xyxy.shape, (0, 4))
 
     def test_detection_structure(self):
         """Test if Detection dataclass works as expected"""
@@ -41,5 +42,46 @@ class TestObjectDetector(unittest.TestCase):
         self.assertEqual(det.class_name, "car")
         self.assertEqual(len(det.bbox), 4)
 
+    def test_detection_batch_iteration(self):
+        """Test if DetectionBatch yields legacy Detection objects"""
+        batch = DetectionBatch(
+            xyxy=np.array([[0, 0, 10, 10], [5, 5, 20, 30]], dtype=np.float32),
+            conf=np.array([0.9, 0.6], dtype=np.float32),
+            cls=np.array([2, 7], dtype=np.int32),
+            names={2: "car", 7: "truck"}
+        )
+        detections = list(batch)
+        self.assertEqual(len(batch), 2)
+        self.assertIsInstance(detections[1], Detection)
+        self.assertEqual(detections[1].class_name, "truck")
+        self.assertEqual(detections[1].bbox, [5.0, 5.0, 20.0, 30.0])
+
+    def test_batched_detect_every(self):
+        """Test that only every Nth frame is detected, with None for the rest"""
+        batcher = BatchedDetector(self.detector, batch_size=2, detect_every=3)
+        frames = [np.zeros((64, 64, 3), dtype=np.uint8) for _ in range(7)]
+        results = []
+        for frame in frames:
+            batcher.submit(frame)
+            if batcher.full:
+                results.extend(batcher.flush())
+        results.extend(batcher.flush())
+        self.assertEqual(len(results), 7)
+        self.assertEqual([r is not None for r in results],
+                         [True, False, False, True, False, False, True])
+        self.assertIsInstance(results[6], DetectionBatch)
+
+    def test_export_path_tracks_settings(self):
+        """Test that exports with a different precision, batch size or imgsz don't share a path"""
+        self.config.model.precision = "fp16"
+        self.config.model.batch_size = 4
+        self.assertEqual(self.detector._export_path("engine"), "yolo11n_640_fp16_b4.engine")
+        self.config.model.precision = "int8"
+        self.assertEqual(self.detector._export_path("engine"), "yolo11n_640_int8_b4.engine")
+        self.config.model.batch_size = 1
+        self.assertEqual(self.detector._export_path("openvino"), "yolo11n_640_int8_b1_openvino_model")
+        self.config.model.imgsz = 960
+        self.assertEqual(self.detector._export_path("onnx"), "yolo11n_960_int8_b1.onnx")
+
 if __name__ == '__main__':
     unittest.main()
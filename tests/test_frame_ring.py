@@ -0,0 +1,68 @@
+import unittest
+import queue
+import tempfile
+import cv2
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.frame_ring import SharedFrameRing, decode_to_ring
+
+SHAPE = (48, 64, 3)
+
+class TestDecodeToRing(unittest.TestCase):
+    def setUp(self):
+        # Small test video with 5 frames of increasing brightness
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.tmpdir.name, "test.avi")
+        writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10,
+                                 (SHAPE[1], SHAPE[0]))
+        for i in range(5):
+            writer.write(np.full(SHAPE, 40 * i, dtype=np.uint8))
+        writer.release()
+        self.ring = SharedFrameRing(2, SHAPE)
+
+    def tearDown(self):
+        self.ring.close()
+        self.ring.unlink()
+        self.tmpdir.cleanup()
+
+    def decode(self, stride):
+        """Decode the whole video in this process, releasing each slot after reading it."""
+        free_q, ready_q = queue.Queue(), queue.Queue()
+        for slot in range(self.ring.n_slots):
+            free_q.put(slot)
+
+        # Return slots as soon as they are read, like the reader thread does
+        class ReleasingQueue:
+            def put(queue_self, item):
+                grabbed, slot = item
+                frame = None if slot is None else self.ring.slot(slot).copy()
+                ready_q.put((grabbed, frame))
+                if slot is not None:
+                    free_q.put(slot)
+
+        decode_to_ring(self.video_path, False, None, stride, self.ring.name, self.ring.n_slots,
+                       SHAPE, free_q, ReleasingQueue())
+        return list(ready_q.queue)
+
+    def test_decodes_all_frames(self):
+        """Test that every frame is decoded into the ring, then the end is signalled"""
+        items = self.decode(stride=1)
+        self.assertEqual([grabbed for grabbed, _ in items], [1, 1, 1, 1, 1, 0])
+        self.assertIsNone(items[-1][1])
+        brightness = [int(round(frame.mean())) for _, frame in items[:-1]]
+        for i, value in enumerate(brightness):
+            self.assertAlmostEqual(value, 40 * i, delta=3)
+
+    def test_stride_counts_skipped_frames(self):
+        """Test that strided decoding reports every grabbed frame"""
+        items = self.decode(stride=2)
+        self.assertEqual(sum(grabbed for grabbed, _ in items), 5)
+        self.assertEqual(len([frame for _, frame in items if frame is not None]), 2)
+
+if __name__ == '__main__':
+    unittest.main()
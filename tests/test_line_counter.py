@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import AppConfig
+from src.line_counter import LineCounter
+from src.tracker import TrackBatch
+
+def make_batch(track_ids, centroids):
+    """Build a TrackBatch of 10x10 boxes around the given centroids."""
+    centroids = np.asarray(centroids, dtype=np.float32).reshape(-1, 2)
+    xyxy = np.hstack([centroids - 5, centroids + 5])
+    n = len(track_ids)
+    return TrackBatch(
+        xyxy=xyxy,
+        conf=np.ones(n, dtype=np.float32),
+        cls=np.full(n, 2, dtype=np.int32),
+        track_id=np.asarray(track_ids, dtype=np.int32),
+        names={2: "vehicle"}
+    )
+
+class TestLineCounter(unittest.TestCase):
+    def setUp(self):
+        self.config = AppConfig()
+        self.config.line.coordinates = [0, 500, 1280, 500]
+        self.config.line.direction = "vertical"
+        self.counter = LineCounter(self.config)
+
+    def test_crossing_counted_once(self):
+        """Test that a track crossing back and forth is only counted once"""
+        self.counter.update(make_batch([1], [(100, 480)]))
+        self.counter.update(make_batch([1], [(100, 520)]))
+        self.counter.update(make_batch([1], [(100, 480)]))
+        stats = self.counter.get_statistics()
+        self.assertEqual(stats["total"], 1)
+        self.assertEqual(stats["down"], 1)
+        self.assertEqual(len(self.counter.crossing_events), 1)
+
+    def test_crossing_event_timestamp(self):
+        """Test that crossing events store an ns timestamp formatted on demand"""
+        self.counter.update(make_batch([1], [(100, 480)]))
+        self.counter.update(make_batch([1], [(100, 520)]))
+        event = self.counter.crossing_events[0]
+        self.assertIsInstance(event.timestamp, int)
+        self.assertRegex(event.iso(), r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}$")
+
+    def test_multiple_tracks(self):
+        """Test that only the tracks that cross are counted, with direction"""
+        self.counter.update(make_batch([1, 2, 3], [(100, 480), (200, 520), (300, 100)]))
+        self.counter.update(make_batch([1, 2, 3], [(100, 520), (200, 480), (300, 120)]))
+        stats = self.counter.get_statistics()
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["down"], 1)
+        self.assertEqual(stats["up"], 1)
+
+    def test_crossing_outside_line_extent(self):
+        """Test that crossing the line's extension is not counted"""
+        self.counter.update(make_batch([1], [(1500, 480)]))
+        self.counter.update(make_batch([1], [(1500, 520)]))
+        self.assertEqual(self.counter.get_total_count(), 0)
+
+    def test_reset(self):
+        """Test that reset clears counts and previous positions"""
+        self.counter.update(make_batch([1], [(100, 480)]))
+        self.counter.update(make_batch([1], [(100, 520)]))
+        self.counter.reset()
+        self.counter.update(make_batch([1], [(100, 480)]))
+        self.assertEqual(self.counter.get_total_count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import AppConfig
+from src.detector import DetectionBatch
+from src.tracker import ObjectTracker
+
+def make_detections(boxes) -> DetectionBatch:
+    """Build a DetectionBatch of vehicle boxes."""
+    n = len(boxes)
+    return DetectionBatch(
+        xyxy=np.asarray(boxes, dtype=np.float32).reshape(n, 4),
+        conf=np.full(n, 0.9, dtype=np.float32),
+        cls=np.full(n, 2, dtype=np.int32),
+        names={2: "car"}
+    )
+
+class TestObjectTracker(unittest.TestCase):
+    def setUp(self):
+        self.config = AppConfig()
+        self.config.model.device = "cpu"
+        self.tracker = ObjectTracker(self.config)
+        # Textured frame so the re-ID embedder gets a real crop
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    def _confirm_moving_track(self):
+        """Feed a box moving right until its track is confirmed."""
+        for i in range(self.config.tracker.n_init + 2):
+            x = 100 + 10 * i
+            batch = self.tracker.update(make_detections([[x, 200, x + 80, 260]]), self.frame)
+        self.assertEqual(len(batch), 1)
+        return self.tracker.tracker.tracker.tracks[0]
+
+    def test_update_without_detections_predicts(self):
+        """update(None, frame) keeps confirmed tracks and moves them by the Kalman prediction"""
+        track = self._confirm_moving_track()
+        track_id = int(track.track_id)
+        time_since_update = track.time_since_update
+        kf = self.tracker.tracker.tracker.kf
+
+        for _ in range(5):
+            # Expected box: one Kalman prediction step from the current state
+            mean, _ = kf.predict(track.mean.copy(), track.covariance.copy())
+            w, h = mean[2] * mean[3], mean[3]
+            expected = [mean[0] - w / 2, mean[1] - h / 2, mean[0] + w / 2, mean[1] + h / 2]
+
+            batch = self.tracker.update(None, self.frame)
+
+            self.assertEqual(batch.track_id.tolist(), [track_id])
+            self.assertEqual(track.time_since_update, time_since_update)
+            np.testing.assert_allclose(batch.xyxy[0], expected, rtol=1e-5)
+
+        # The box keeps moving right with the estimated velocity
+        self.assertGreater(batch.xyxy[0, 0], 100 + 10 * (self.config.tracker.n_init + 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import CLASS_COLOR_LUT, get_color_for_class, prepare_box_draws
+
+class TestPrepareBoxDraws(unittest.TestCase):
+    def test_boxes_truncated_like_int(self):
+        """Test that boxes are cast to int32 the same way as int()"""
+        xyxy = np.array([[10.7, 20.2, 30.9, 40.5], [-3.5, 0.0, 5.5, 6.99]], dtype=np.float32)
+        boxes, _ = prepare_box_draws(xyxy, np.array([2, 2], dtype=np.int32), CLASS_COLOR_LUT)
+        self.assertEqual(boxes.dtype, np.int32)
+        self.assertEqual(boxes.tolist(), [[int(v) for v in box] for box in xyxy.tolist()])
+
+    def test_colors_match_class_colors(self):
+        """Test that colors match get_color_for_class, including unknown IDs"""
+        cls = np.array([0, 2, 7, 42, 1000], dtype=np.int32)
+        _, colors = prepare_box_draws(np.zeros((5, 4), dtype=np.float32), cls, CLASS_COLOR_LUT)
+        self.assertEqual([tuple(c) for c in colors.tolist()],
+                         [get_color_for_class(int(c)) for c in cls])
+
+if __name__ == '__main__':
+    unittest.main()
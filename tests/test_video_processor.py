@@ -0,0 +1,92 @@
+import unittest
+import tempfile
+import threading
+import cv2
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import AppConfig
+from src.video_processor import VideoProcessor
+
+SHAPE = (96, 128, 3)
+
+class FailingWriter:
+    """Video writer stand-in that raises on the Nth frame, like a full disk."""
+    def __init__(self, fail_at: int):
+        self.fail_at = fail_at
+        self.frames = 0
+
+    def write(self, frame):
+        self.frames += 1
+        if self.frames == self.fail_at:
+            raise OSError("No space left on device")
+
+    def release(self):
+        pass
+
+class TestVideoProcessorFailures(unittest.TestCase):
+    def setUp(self):
+        # Enough frames to fill every pipeline queue behind a dead stage
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.tmpdir.name, "test.avi")
+        writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10,
+                                 (SHAPE[1], SHAPE[0]))
+        for _ in range(60):
+            writer.write(np.zeros(SHAPE, dtype=np.uint8))
+        writer.release()
+
+        config = AppConfig()
+        config.model.name = "yolo11n.pt"
+        config.video.show_display = False
+        config.video.save_output = True
+        self.processor = VideoProcessor(config)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _run(self) -> BaseException:
+        """Run process_video on a thread and return the exception it raised."""
+        raised = []
+
+        def target():
+            try:
+                self.processor.process_video(
+                    self.video_path, os.path.join(self.tmpdir.name, "out.mp4"))
+            except BaseException as e:
+                raised.append(e)
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout=120)
+        self.assertFalse(thread.is_alive(), "process_video hung after a stage failed")
+        self.assertEqual(len(raised), 1, "process_video did not raise")
+        return raised[0]
+
+    def test_writer_error_is_raised(self):
+        """A failing writer.write surfaces from process_video instead of hanging"""
+        self.processor._open_writer = lambda *args: FailingWriter(fail_at=3)
+        error = self._run()
+        self.assertIsInstance(error, OSError)
+
+    def test_visualize_error_is_raised(self):
+        """A failing _visualize surfaces from process_video instead of hanging"""
+        visualize = self.processor._visualize
+        calls = []
+
+        def failing_visualize(*args):
+            calls.append(1)
+            if len(calls) == 3:
+                raise RuntimeError("visualize failed")
+            return visualize(*args)
+
+        self.processor._visualize = failing_visualize
+        error = self._run()
+        self.assertIsInstance(error, RuntimeError)
+        self.assertEqual(str(error), "visualize failed")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -60,7 +60,7 @@ def test_utils():
         assert centroid == (50.0, 50.0), "Centroid calculation failed"
         
         # Test line intersection
-        intersects = line_intersection((0, 0), (100, 100), (0, 100), (100, 0))
+        intersects = line_intersection(0.0, 0.0, 100.0, 100.0, 0.0, 100.0, 100.0, 0.0)
         assert intersects == True, "Line intersection failed"
         
         # Test color